@@ -1,17 +1,20 @@
 from sudoku_solver.helper import (
-    is_solved_sudoku,
-    is_valid_sudoku,
+    BOX_INDEX,
+    is_solved_masks,
     read_sudoku_csv,
     print_sudoku_matrix,
 )
 from sudoku_solver.solver import (
-    find_unique_intersections,
+    backtrack,
+    find_unique_intersections_mask,
 )
 
-sudoku_matrix = read_sudoku_csv("sudoku.csv")
-
-if not is_valid_sudoku(sudoku_matrix):
-    print("Matriz de Sudoku inválida")
+# Read and validate the sudoku matrix, along with the numbers present in each
+# row, column and 3x3 box (kept up to date as values are filled)
+try:
+    sudoku_matrix, row_mask, col_mask, box_mask = read_sudoku_csv("sudoku.csv")
+except ValueError as error:
+    print(f"Matriz de Sudoku inválida: {error}")
     exit(1)
 
 # Print the sudoku matrix
@@ -19,7 +22,9 @@ print_sudoku_matrix(sudoku_matrix)
 
 while True:
     # Find unique intersections
-    unique_intersections = find_unique_intersections(sudoku_matrix)
+    unique_intersections = find_unique_intersections_mask(
+        sudoku_matrix, row_mask, col_mask, box_mask
+    )
 
     # Check condition after first iteration - if no intersections found, break
     if not unique_intersections:
@@ -28,13 +33,27 @@ while True:
 
     # Fill unique intersections in the sudoku matrix
     for row_index, col_index, value in unique_intersections:
-        sudoku_matrix[row_index][col_index] = value
+        sudoku_matrix[row_index, col_index] = value
+        bit = 1 << (value - 1)
+        row_mask[row_index] |= bit
+        col_mask[col_index] |= bit
+        box_mask[BOX_INDEX[row_index * 9 + col_index]] |= bit
+
+    print(f"{len(unique_intersections)} interseções únicas preenchidas")
 
     # Print the sudoku matrix
     print_sudoku_matrix(sudoku_matrix)
 
 # Check if the sudoku matrix is solved
-if is_solved_sudoku(sudoku_matrix):
+if is_solved_masks(row_mask, col_mask, box_mask):
     print("Sudoku resolvido! Sua teoria está correta!")
 else:
     print("Sudoku não resolvido! Sua teoria está errada!")
+
+    # Fall back to trying candidates for the cells that are left
+    print("Tentando resolver por tentativa e erro (backtracking)...")
+    if backtrack(sudoku_matrix, row_mask, col_mask, box_mask):
+        print_sudoku_matrix(sudoku_matrix)
+        print("Sudoku resolvido por tentativa e erro!")
+    else:
+        print("Sudoku sem solução!")
@@ -0,0 +1,111 @@
+"""
+Numba-compiled kernels for the Sudoku solver.
+
+The kernels work on a 9x9 NumPy int8 grid (0 for empty cells) and on uint16
+arrays of 9 bitmasks, where number n (1-9) is stored as bit (n - 1).
+
+Each kernel is declared with its signature, so Numba compiles it when this
+module is imported (or loads it from the on-disk cache) instead of on the
+first call.
+"""
+
+import math
+
+import numpy as np
+from numba import njit, prange
+
+
+@njit("UniTuple(u2[:], 3)(i1[:, :])", cache=True)
+def compute_masks_nb(grid):
+    """
+    Compute the bitmasks of the numbers present in each row, column and 3x3 box.
+
+    Args:
+        grid: A 9x9 int8 array containing integers from 0-9.
+
+    Returns:
+        A tuple (row_mask, col_mask, box_mask) of three uint16 arrays with 9 elements.
+    """
+    row_mask = np.zeros(9, dtype=np.uint16)
+    col_mask = np.zeros(9, dtype=np.uint16)
+    box_mask = np.zeros(9, dtype=np.uint16)
+
+    for row_index in range(9):
+        for col_index in range(9):
+            value = grid[row_index, col_index]
+            if value != 0:
+                bit = 1 << (value - 1)
+                row_mask[row_index] |= bit
+                col_mask[col_index] |= bit
+                box_mask[(row_index // 3) * 3 + col_index // 3] |= bit
+
+    return row_mask, col_mask, box_mask
+
+
+@njit("i4(i1[:, :], u2[:], u2[:], u2[:], i4[:, :])", cache=True)
+def find_unique_intersections_nb(grid, row_mask, col_mask, box_mask, out):
+    """
+    Find the empty cells whose row, column and box leave a single candidate.
+
+    Args:
+        grid: A 9x9 int8 array containing integers from 0-9.
+        row_mask: uint16 array with the 9 row bitmasks of the grid.
+        col_mask: uint16 array with the 9 column bitmasks of the grid.
+        box_mask: uint16 array with the 9 box bitmasks of the grid.
+        out: An int32 array of shape (81, 3) that receives one
+             (row_index, col_index, value) triple per unique intersection.
+
+    Returns:
+        The number of triples written to out.
+    """
+    count = 0
+
+    for col_index in range(9):
+        for row_index in range(9):
+            if grid[row_index, col_index] == 0:
+                box_index = (row_index // 3) * 3 + col_index // 3
+                cand = np.uint16(
+                    0x1FF
+                    & ~(row_mask[row_index] | col_mask[col_index] | box_mask[box_index])
+                )
+
+                # Exactly one bit set: its position gives the number
+                if cand != 0 and cand & (cand - 1) == 0:
+                    out[count, 0] = row_index
+                    out[count, 1] = col_index
+                    out[count, 2] = int(math.log2(cand)) + 1
+                    count += 1
+
+    return count
+
+
+@njit(
+    "void(i1[:, :, :], u2[:, :], u2[:, :], u2[:, :], i4[:, :, :], i4[:])",
+    parallel=True,
+    cache=True,
+)
+def find_unique_intersections_batch_nb(grids, row_masks, col_masks, box_masks, out, counts):
+    """
+    Run find_unique_intersections_nb on a batch of puzzles, in parallel threads.
+
+    Each puzzle is handled by a single thread and writes only to its own slots
+    of out and counts, so no synchronization is needed.
+
+    Args:
+        grids: An (N, 9, 9) int8 array with N puzzles.
+        row_masks: (N, 9) uint16 array with the row bitmasks of each puzzle.
+        col_masks: (N, 9) uint16 array with the column bitmasks of each puzzle.
+        box_masks: (N, 9) uint16 array with the box bitmasks of each puzzle.
+        out: An (N, 81, 3) int32 array that receives the (row_index, col_index, value)
+             triples of each puzzle.
+        counts: An int32 array of N elements that receives the number of triples
+                written for each puzzle.
+    """
+    for puzzle_index in prange(grids.shape[0]):
+        counts[puzzle_index] = find_unique_intersections_nb(
+            grids[puzzle_index],
+            row_masks[puzzle_index],
+            col_masks[puzzle_index],
+            box_masks[puzzle_index],
+            out[puzzle_index],
+        )
@@ -2,16 +2,61 @@
 Helper functions for Sudoku solver.
 """
 
-import csv
+import sys
 from pathlib import Path
-from typing import List
+from typing import List, Tuple, Union
 
+import numpy as np
 
-def read_sudoku_csv(file_path: str = "sudoku.csv") -> List[List[int]]:
+# A 9x9 Sudoku matrix of integers from 0-9: nested lists or a (9, 9) NumPy array
+SudokuMatrix = Union[np.ndarray, List[List[int]]]
+
+# Bitmask with every Sudoku number (1-9) present; number n is stored as bit (n - 1)
+FULL_MASK = 0x1FF
+
+# Box (0-8) of each cell, indexed by row_index * 9 + col_index; boxes are numbered
+# from left to right and top to bottom, i.e. (row_index // 3) * 3 + col_index // 3
+BOX_INDEX = tuple(
+    (row_index // 3) * 3 + col_index // 3 for row_index in range(9) for col_index in range(9)
+)
+
+# Integer value of the usual CSV cells: empty ("" or "0") or a single digit
+_CELL_VALUES = {str(number): number for number in range(10)}
+_CELL_VALUES[""] = 0
+
+
+def _build_sudoku_template() -> str:
+    """
+    Build the format string used by print_sudoku_matrix, with one {} per cell.
     """
-    Read a Sudoku puzzle from a CSV file and store it in a 9x9 matrix.
+    row = "│ " + " │ ".join(["{} {} {}"] * 3) + " │\n"
+    box_separator = "├" + "─" * 7 + "┼" + "─" * 7 + "┼" + "─" * 7 + "┤\n"
+    box_rows = row * 3
+
+    return (
+        "\n" + "═" * 37 + "\n"
+        + " " * 12 + "QUEBRA-CABEÇA SUDOKU\n"
+        + "═" * 37 + "\n"
+        + box_separator.join([box_rows] * 3)
+        + "═" * 37 + "\n\n"
+    )
+
 
-    The matrix is indexed from [0][0] to [8][8], where:
+# Sudoku board with borders and box separators, ready to be filled with the 81 cells
+_SUDOKU_TEMPLATE = _build_sudoku_template()
+
+
+def read_sudoku_csv(
+    file_path: str = "sudoku.csv",
+) -> Tuple[np.ndarray, List[int], List[int], List[int]]:
+    """
+    Read a Sudoku puzzle from a CSV file and store it in a 9x9 NumPy int8 array.
+
+    The puzzle is validated while it is read: the bitmasks of the numbers
+    present in each row, column and 3x3 box are built in the same pass
+    and a repeated number is rejected right away.
+
+    The matrix is indexed from [0, 0] to [8, 8], where:
     - First index is the row (0-8)
     - Second index is the column (0-8)
 
@@ -20,14 +65,17 @@ def read_sudoku_csv(file_path: str = "sudoku.csv") -> List[List[int]]:
                    Defaults to "sudoku.csv" in the current directory.
 
     Returns:
-        A 9x9 matrix (list of lists) containing integers from 0-9.
-        - 0 represents an empty cell
-        - 1-9 represent filled cells with the corresponding number
+        A tuple (matrix, row_mask, col_mask, box_mask):
+        - matrix: A 9x9 int8 array containing integers from 0-9.
+          0 represents an empty cell, 1-9 represent filled cells with the corresponding number
+        - row_mask, col_mask, box_mask: Lists with the 9 bitmasks of the numbers
+          present in each row, column and 3x3 box (number n is stored as bit n - 1)
 
     Raises:
         FileNotFoundError: If the CSV file doesn't exist.
         ValueError: If the CSV doesn't have exactly 9 rows or 9 columns,
-                   or if any cell contains a value outside the valid range (0-9).
+                   if any cell contains a value outside the valid range (0-9),
+                   or if a number is repeated in a row, column or 3x3 box.
 
     Empty Cell Handling:
         Empty cells in the CSV can be represented as:
@@ -51,59 +99,87 @@ def read_sudoku_csv(file_path: str = "sudoku.csv") -> List[List[int]]:
     if not csv_path.exists():
         raise FileNotFoundError(f"Arquivo CSV do Sudoku não encontrado: {file_path}")
 
-    matrix = []
-
-    with open(csv_path, "r", newline="", encoding="utf-8") as csvfile:
-        reader = csv.reader(csvfile)
-
-        for row_index, row in enumerate(reader):
-            if row_index >= 9:
-                raise ValueError(
-                    f"Arquivo CSV tem mais de 9 linhas. Linha encontrada no índice {row_index}"
-                )
-
-            # Ensure we have exactly 9 columns
-            if len(row) != 9:
-                raise ValueError(
-                    f"Linha {row_index} tem {len(row)} colunas, esperado 9. Encontrado: {row}"
-                )
-
-            # Convert each cell to integer (empty strings become 0)
-            matrix_row = []
-            for col_index, cell in enumerate(row):
-                cell = cell.strip()  # Remove whitespace
-                if cell == "" or cell == "0":
-                    matrix_row.append(0)
-                else:
-                    try:
-                        cell_value = int(cell)
-                        # Validate that the value is in the valid range (0-9)
-                        if cell_value < 0 or cell_value > 9:
-                            raise ValueError(
-                                f"Valor fora do intervalo na linha {row_index}, coluna {col_index}: '{cell}'. "
-                                f"Esperado um número de 0-9 (0 para vazio, 1-9 para células preenchidas)."
-                            )
-                        matrix_row.append(cell_value)
-                    except ValueError as e:
-                        # Re-raise if it's our custom validation error
-                        if "Valor fora do intervalo" in str(e):
-                            raise
-                        # Otherwise, it's a conversion error
-                        raise ValueError(
-                            f"Valor inválido na linha {row_index}, coluna {col_index}: '{cell}'. "
-                            f"Esperado um número de 0-9 (0 para vazio, 1-9 para células preenchidas)."
-                        ) from e
-
-            matrix.append(matrix_row)
+    matrix = np.zeros((9, 9), dtype=np.int8)
+    row_count = 0
+    row_mask = [0] * 9
+    col_mask = [0] * 9
+    box_mask = [0] * 9
+
+    # The format is plain comma-separated digits, so no csv dialect handling is needed
+    lines = csv_path.read_text(encoding="utf-8").splitlines()
+
+    for row_index, line in enumerate(lines):
+        if row_index >= 9:
+            raise ValueError(
+                f"Arquivo CSV tem mais de 9 linhas. Linha encontrada no índice {row_index}"
+            )
+
+        row = line.split(",")
+
+        # Ensure we have exactly 9 columns
+        if len(row) != 9:
+            raise ValueError(
+                f"Linha {row_index} tem {len(row)} colunas, esperado 9. Encontrado: {row}"
+            )
+
+        # Convert each cell to integer (empty strings become 0)
+        for col_index, cell in enumerate(row):
+            cell = cell.strip()  # Remove whitespace
+
+            # Empty cells and single digits are looked up directly
+            cell_value = _CELL_VALUES.get(cell)
+            if cell_value is None:
+                cell_value = _parse_cell(cell, row_index, col_index)
+
+            # Record the number in its row, column and box, rejecting repeats
+            if cell_value != 0:
+                matrix[row_index, col_index] = cell_value
+                bit = 1 << (cell_value - 1)
+                box_index = BOX_INDEX[row_index * 9 + col_index]
+                if (row_mask[row_index] | col_mask[col_index] | box_mask[box_index]) & bit:
+                    raise ValueError(
+                        f"Valor repetido na linha {row_index}, coluna {col_index}: '{cell}'. "
+                        f"Cada número de 1-9 só pode aparecer uma vez por linha, coluna e caixa 3x3."
+                    )
+                row_mask[row_index] |= bit
+                col_mask[col_index] |= bit
+                box_mask[box_index] |= bit
+
+        row_count += 1
 
     # Ensure we have exactly 9 rows
-    if len(matrix) != 9:
-        raise ValueError(f"Arquivo CSV tem {len(matrix)} linhas, esperado 9")
+    if row_count != 9:
+        raise ValueError(f"Arquivo CSV tem {row_count} linhas, esperado 9")
 
-    return matrix
+    return matrix, row_mask, col_mask, box_mask
 
 
-def print_sudoku_matrix(matrix: List[List[int]]) -> None:
+def _parse_cell(cell: str, row_index: int, col_index: int) -> int:
+    """
+    Convert a CSV cell that is not an empty cell or a single digit (e.g. "05").
+
+    Raises:
+        ValueError: If the cell is not a number or is outside the valid range (0-9).
+    """
+    try:
+        cell_value = int(cell)
+    except ValueError as e:
+        raise ValueError(
+            f"Valor inválido na linha {row_index}, coluna {col_index}: '{cell}'. "
+            f"Esperado um número de 0-9 (0 para vazio, 1-9 para células preenchidas)."
+        ) from e
+
+    # Validate that the value is in the valid range (0-9)
+    if cell_value < 0 or cell_value > 9:
+        raise ValueError(
+            f"Valor fora do intervalo na linha {row_index}, coluna {col_index}: '{cell}'. "
+            f"Esperado um número de 0-9 (0 para vazio, 1-9 para células preenchidas)."
+        )
+
+    return cell_value
+
+
+def print_sudoku_matrix(matrix: SudokuMatrix) -> None:
     """
     Print a 9x9 Sudoku matrix in a visually appealing format.
 
@@ -113,35 +189,15 @@ def print_sudoku_matrix(matrix: List[List[int]]) -> None:
     - Empty cells (0) displayed as dots
 
     Args:
-        matrix: A 9x9 matrix (list of lists) containing integers from 0-9.
+        matrix: A 9x9 matrix (list of lists or NumPy array) containing integers from 0-9.
     """
-    print("\n" + "═" * 37)
-    print(" " * 12 + "QUEBRA-CABEÇA SUDOKU")
-    print("═" * 37)
-
-    for row_index, row in enumerate(matrix):
-        if row_index % 3 == 0 and row_index > 0:
-            print("├" + "─" * 7 + "┼" + "─" * 7 + "┼" + "─" * 7 + "┤")
-
-        # Print row with borders
-        row_str = "│ "
-        for col_index, cell in enumerate(row):
-            if col_index % 3 == 0 and col_index > 0:
-                row_str += "│ "
+    # Empty cells (0) are displayed as dots
+    cells = [cell if cell != 0 else "·" for cell in np.ravel(matrix).tolist()]
 
-            # Display 0 as a dot, other numbers as themselves
-            if cell == 0:
-                row_str += "· "
-            else:
-                row_str += f"{cell} "
+    sys.stdout.write(_SUDOKU_TEMPLATE.format(*cells))
 
-        row_str += "│"
-        print(row_str)
 
-    print("═" * 37 + "\n")
-
-
-def is_valid_sudoku(matrix: List[List[int]]) -> bool:
+def is_valid_sudoku(matrix: SudokuMatrix) -> bool:
     """
     Verify if the input 9x9 Sudoku matrix is valid.
 
@@ -151,7 +207,7 @@ def is_valid_sudoku(matrix: List[List[int]]) -> bool:
     3. All 9 3x3 boxes must not have repeated values (empty/0 values are allowed and ignored)
 
     Args:
-        matrix: A 9x9 matrix (list of lists) containing integers from 0-9.
+        matrix: A 9x9 matrix (list of lists or NumPy array) containing integers from 0-9.
                 Indexed from [0][0] to [8][8].
                 0 represents empty cells, 1-9 represent filled cells.
 
@@ -168,39 +224,66 @@ def is_valid_sudoku(matrix: List[List[int]]) -> bool:
         >>> is_valid_sudoku(matrix)
         True
     """
-    # Validate rows
-    for row_index, row in enumerate(matrix):
-        non_zero_values = [cell for cell in row if cell != 0]
-        if len(non_zero_values) != len(set(non_zero_values)):
-            return False
-
-    # Validate columns
-    for col_index in range(9):
-        column = [matrix[row_index][col_index] for row_index in range(9)]
-        non_zero_values = [cell for cell in column if cell != 0]
-        if len(non_zero_values) != len(set(non_zero_values)):
-            return False
-
-    # Validate 3x3 boxes
-    for box_row in range(3):
-        for box_col in range(3):
-            box_values = []
-            # Get all values in this 3x3 box
-            for row_offset in range(3):
-                for col_offset in range(3):
-                    row_index = box_row * 3 + row_offset
-                    col_index = box_col * 3 + col_offset
-                    box_values.append(matrix[row_index][col_index])
-
-            # Check for duplicates (ignoring 0)
-            non_zero_values = [cell for cell in box_values if cell != 0]
-            if len(non_zero_values) != len(set(non_zero_values)):
-                return False
+    row_mask = [0] * 9
+    col_mask = [0] * 9
+    box_mask = [0] * 9
+
+    # Validate rows, columns and 3x3 boxes in a single pass, stopping at the first repeat.
+    # Cells are read as Python ints, since shifting int8 array values would overflow.
+    for row_index, row in enumerate(np.asarray(matrix).tolist()):
+        for col_index, cell in enumerate(row):
+            if cell != 0:
+                bit = 1 << (cell - 1)
+                box_index = BOX_INDEX[row_index * 9 + col_index]
+                if (row_mask[row_index] | col_mask[col_index] | box_mask[box_index]) & bit:
+                    return False
+                row_mask[row_index] |= bit
+                col_mask[col_index] |= bit
+                box_mask[box_index] |= bit
 
     return True
 
 
-def is_solved_sudoku(matrix: List[List[int]]) -> bool:
+def compute_masks(
+    matrix: SudokuMatrix,
+) -> Tuple[List[int], List[int], List[int]]:
+    """
+    Compute the bitmasks of the numbers present in each row, column and 3x3 box.
+
+    Number n (1-9) is stored as bit (n - 1), so a unit holding all nine numbers
+    has the mask FULL_MASK (0x1FF) and the numbers missing from it are
+    FULL_MASK ^ mask. Empty cells (0) do not set any bit.
+
+    Args:
+        matrix: A 9x9 matrix (list of lists or NumPy array) containing integers from 0-9.
+                Indexed from [0][0] to [8][8].
+
+    Returns:
+        A tuple (row_mask, col_mask, box_mask) of three lists with 9 integers each.
+        Boxes are numbered from left to right and top to bottom, so the cell
+        [row_index][col_index] belongs to box BOX_INDEX[row_index * 9 + col_index].
+
+    Example:
+        If row 0 is [5, 3, 0, 0, 7, 0, 0, 0, 0],
+        row_mask[0] is 0b001010100 (bits 2, 4 and 6 for the numbers 3, 5 and 7).
+    """
+    row_mask = [0] * 9
+    col_mask = [0] * 9
+    box_mask = [0] * 9
+
+    # Cells are read as Python ints, since shifting int8 array values would overflow
+    for row_index, row in enumerate(np.asarray(matrix).tolist()):
+        for col_index, cell in enumerate(row):
+            if cell != 0:
+                bit = 1 << (cell - 1)
+                row_mask[row_index] |= bit
+                col_mask[col_index] |= bit
+                box_mask[BOX_INDEX[row_index * 9 + col_index]] |= bit
+
+    return row_mask, col_mask, box_mask
+
+
+def is_solved_sudoku(matrix: SudokuMatrix) -> bool:
     """
     Verify if the input 9x9 Sudoku matrix is solved.
 
@@ -212,3 +295,30 @@ def is_solved_sudoku(matrix: List[List[int]]) -> bool:
     return is_valid_sudoku(matrix) and all(
         all(cell != 0 for cell in row) for row in matrix
     )
+
+
+def is_solved_masks(
+    row_mask: List[int],
+    col_mask: List[int],
+    box_mask: List[int],
+) -> bool:
+    """
+    Verify if a 9x9 Sudoku puzzle is solved, from its row, column and box bitmasks.
+
+    A unit (row, column or 3x3 box) has 9 cells, so its mask is FULL_MASK (0x1FF)
+    only when it holds each number from 1 to 9 exactly once. The puzzle is solved
+    when all 27 masks are full, which takes 27 integer comparisons instead of
+    walking the matrix.
+
+    Args:
+        row_mask: The 9 row bitmasks of the numbers present in the puzzle,
+                  as returned by read_sudoku_csv or helper.compute_masks.
+        col_mask: The 9 column bitmasks of the numbers present in the puzzle.
+        box_mask: The 9 box bitmasks of the numbers present in the puzzle.
+
+    Returns:
+        True if every row, column and 3x3 box contains all numbers from 1 to 9.
+    """
+    return all(
+        mask == FULL_MASK for masks in (row_mask, col_mask, box_mask) for mask in masks
+    )
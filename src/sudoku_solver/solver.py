@@ -2,11 +2,57 @@
 Sudoku solver functions implementing the custom algorithm.
 """
 
-# All valid numbers in a Sudoku puzzle (1-9)
-VALID_SUDOKU_NUMBERS = set(range(1, 10))
+import numpy as np
 
+from sudoku_solver import _kernels
+from sudoku_solver.helper import BOX_INDEX, FULL_MASK, SudokuMatrix, is_valid_sudoku
 
-def get_missing_numbers_in_rows(matrix: list[list[int]]) -> list[list[int]]:
+
+def mask_to_numbers(mask: int) -> list[int]:
+    """
+    Expand a 9-bit mask into the sorted list of numbers (1-9) it contains.
+
+    Example:
+        mask_to_numbers(0b100000101) returns [1, 3, 9]
+    """
+    numbers = []
+
+    # Take the lowest set bit until none is left; its bit length is the number
+    while mask:
+        bit = mask & -mask
+        numbers.append(bit.bit_length())
+        mask ^= bit
+
+    return numbers
+
+
+# Missing numbers (1-9) for every possible mask of present numbers, indexed by the mask
+MISSING_FOR_MASK = tuple(tuple(mask_to_numbers(FULL_MASK ^ mask)) for mask in range(512))
+
+# Number of bits set in every possible mask, indexed by the mask
+BIT_COUNT_FOR_MASK = np.array([bin(mask).count("1") for mask in range(512)], dtype=np.int8)
+
+
+def get_row_and_column_masks(matrix: SudokuMatrix) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Compute the bitmasks of the numbers present in every row and column at once.
+
+    The matrix is converted to a NumPy array and each cell is turned into the
+    bit of its number (1 << value >> 1 gives bit (value - 1), and 0 for empty
+    cells), so all masks come out of two vectorized OR reductions.
+
+    Args:
+        matrix: A 9x9 matrix (list of lists or NumPy array) containing integers from 0-9.
+
+    Returns:
+        A tuple (row_mask, col_mask) of two uint16 arrays with 9 elements.
+    """
+    bits = (1 << np.asarray(matrix, dtype=np.uint16)) >> 1
+
+    return np.bitwise_or.reduce(bits, axis=1), np.bitwise_or.reduce(bits, axis=0)
+
+
+def get_missing_numbers_in_rows(matrix: SudokuMatrix) -> list[tuple[int, ...]]:
     """
     Analyze each row of the Sudoku matrix and return missing numbers for each row.
 
@@ -14,33 +60,25 @@ def get_missing_numbers_in_rows(matrix: list[list[int]]) -> list[list[int]]:
     Empty cells (represented as 0) are ignored when checking for present numbers.
 
     Args:
-        matrix: A 9x9 matrix (list of lists) containing integers from 0-9.
+        matrix: A 9x9 matrix (list of lists or NumPy array) containing integers from 0-9.
                 Indexed from [0][0] to [8][8].
 
     Returns:
-        A list of 9 lists, where each list contains the missing numbers (1-9)
-        for the corresponding row. Each inner list is sorted in ascending order.
+        A list of 9 tuples, where each tuple contains the missing numbers (1-9)
+        for the corresponding row. Each tuple is sorted in ascending order.
 
         Example:
             If row 0 has [5, 3, 0, 0, 7, 0, 0, 0, 0],
-            the missing numbers are [1, 2, 4, 6, 8, 9]
+            the missing numbers are (1, 2, 4, 6, 8, 9)
             (since 3, 5, 7 are present)
     """
-    missing_per_row = []
-
-    for row in matrix:
-        # Get all non-zero numbers present in this row
-        present_numbers = {cell for cell in row if cell != 0}
-
-        # Find missing numbers by subtracting present numbers from all numbers
-        missing_numbers = sorted(list(VALID_SUDOKU_NUMBERS - present_numbers))
-
-        missing_per_row.append(missing_numbers)
+    row_mask, _ = get_row_and_column_masks(matrix)
 
-    return missing_per_row
+    # Look up the numbers missing for each row mask
+    return [MISSING_FOR_MASK[mask] for mask in row_mask.tolist()]
 
 
-def get_missing_numbers_in_columns(matrix: list[list[int]]) -> list[list[int]]:
+def get_missing_numbers_in_columns(matrix: SudokuMatrix) -> list[tuple[int, ...]]:
     """
     Analyze each column of the Sudoku matrix and return missing numbers for each column.
 
@@ -48,58 +86,72 @@ def get_missing_numbers_in_columns(matrix: list[list[int]]) -> list[list[int]]:
     Empty cells (represented as 0) are ignored when checking for present numbers.
 
     Args:
-        matrix: A 9x9 matrix (list of lists) containing integers from 0-9.
+        matrix: A 9x9 matrix (list of lists or NumPy array) containing integers from 0-9.
                 Indexed from [0][0] to [8][8].
 
     Returns:
-        A list of 9 lists, where each list contains the missing numbers (1-9)
-        for the corresponding column. Each inner list is sorted in ascending order.
-        The index of each inner list corresponds to the column index (0-8).
+        A list of 9 tuples, where each tuple contains the missing numbers (1-9)
+        for the corresponding column. Each tuple is sorted in ascending order.
+        The index of each tuple corresponds to the column index (0-8).
 
         Example:
             If column 0 has [5, 6, 0, 8, 4, 7, 0, 0, 0],
-            the missing numbers are [1, 2, 3, 9]
+            the missing numbers are (1, 2, 3, 9)
             (since 4, 5, 6, 7, 8 are present)
     """
-    missing_per_column = []
+    _, col_mask = get_row_and_column_masks(matrix)
 
-    for col_index in range(9):
-        # Get all non-zero numbers present in this column
-        column = [matrix[row_index][col_index] for row_index in range(9)]
-        present_numbers = {cell for cell in column if cell != 0}
+    # Look up the numbers missing for each column mask
+    return [MISSING_FOR_MASK[mask] for mask in col_mask.tolist()]
 
-        # Find missing numbers by subtracting present numbers from all numbers
-        missing_numbers = sorted(list(VALID_SUDOKU_NUMBERS - present_numbers))
 
-        missing_per_column.append(missing_numbers)
+def _require_array(values, dtype, shape: tuple[int, ...]) -> np.ndarray:
+    """
+    Convert values to a writable array of the given dtype, checking its shape.
+
+    Raises:
+        ValueError: If the array does not have the expected shape.
+    """
+    array = np.require(values, dtype, ["W"])
+    if array.shape != shape:
+        raise ValueError(
+            f"Formato inválido: {array.shape}. Esperado um array de formato {shape}."
+        )
 
-    return missing_per_column
+    return array
 
 
-def find_unique_intersections(matrix: list[list[int]]) -> list[tuple[int, int, int]]:
+def find_unique_intersections(
+    matrix: SudokuMatrix, verbose: bool = False
+) -> list[tuple[int, int, int]]:
     """
-    Find cells where the intersection of missing row and column numbers has exactly one element.
+    Find cells where the intersection of missing row, column and box numbers has exactly one element.
 
     For each empty cell (value 0), this function:
     1. Gets the missing numbers in that cell's row
     2. Gets the missing numbers in that cell's column
-    3. Finds the intersection of these two sets
-    4. If the intersection has exactly one element, that value can be placed in that cell
+    3. Gets the missing numbers in that cell's 3x3 box
+    4. Finds the intersection of these three sets
+    5. If the intersection has exactly one element, that value can be placed in that cell
 
     Args:
-        matrix: A 9x9 matrix (list of lists) containing integers from 0-9.
+        matrix: A 9x9 matrix (list of lists or NumPy array) containing integers from 0-9.
                 Indexed from [0][0] to [8][8].
                 0 represents empty cells, 1-9 represent filled cells.
+        verbose: If True, print each unique intersection found. Defaults to False.
 
     Returns:
         A list of tuples, where each tuple contains (row_index, col_index, value):
         - row_index (int): The row index (0-8)
         - col_index (int): The column index (0-8)
-        - value (int): The unique value that is missing in both the row and column
+        - value (int): The unique value that is missing in the row, column and box
 
         Only cells where the intersection has exactly one element are included.
         Only empty cells (value 0) are considered.
 
+    Raises:
+        ValueError: If the matrix is not 9x9.
+
     Example:
         If row 0 is missing [1, 2, 4] and column 0 is missing [1, 3, 4],
         the intersection is [1, 4]. Since it has 2 elements, this cell is not included.
@@ -107,32 +159,264 @@ def find_unique_intersections(matrix: list[list[int]]) -> list[tuple[int, int, i
         If row 0 is missing [1, 2] and column 0 is missing [1, 3],
         the intersection is [1]. Since it has exactly 1 element,
         the result includes (0, 0, 1).
+
+        If row 0 is missing [1, 2, 4], column 0 is missing [1, 3, 4]
+        and box 0 is missing [4, 5], the intersection is [4],
+        so the result includes (0, 0, 4).
+    """
+    # Convert the matrix once and get the numbers present in all rows, columns and boxes
+    grid = _require_array(matrix, np.int8, (9, 9))
+    row_mask, col_mask, box_mask = _kernels.compute_masks_nb(grid)
+
+    return find_unique_intersections_mask(grid, row_mask, col_mask, box_mask, verbose)
+
+
+def find_unique_intersections_mask(
+    matrix: SudokuMatrix,
+    row_mask: list[int],
+    col_mask: list[int],
+    box_mask: list[int],
+    verbose: bool = False,
+) -> list[tuple[int, int, int]]:
     """
-    # Get missing numbers for all rows and columns
-    missing_in_rows = get_missing_numbers_in_rows(matrix)
-    missing_in_columns = get_missing_numbers_in_columns(matrix)
-
-    result = []
-
-    # Outer loop: iterate over columns
-    for col_index in range(9):
-        # Inner loop: iterate over rows
-        for row_index in range(9):
-            # Only process empty cells (value 0)
-            if matrix[row_index][col_index] == 0:
-                # Get missing numbers for this row and column
-                missing_row = set(missing_in_rows[row_index])
-                missing_col = set(missing_in_columns[col_index])
-
-                # Find the intersection (numbers missing in both row and column)
-                intersection = missing_row & missing_col
-
-                # If intersection has exactly one element, add it to results
-                if len(intersection) == 1:
-                    unique_value = intersection.pop()
-                    print(
-                        f"Interseção única encontrada na linha {row_index}, coluna {col_index}: {unique_value}"
-                    )
-                    result.append((row_index, col_index, unique_value))
+    Find unique intersections using precomputed row, column and box bitmasks.
+
+    Same as find_unique_intersections, but the masks are passed in instead of
+    being rebuilt from the matrix. This lets the caller get them once (from
+    read_sudoku_csv, helper.compute_masks or _kernels.compute_masks_nb) and keep
+    them up to date as values are placed. Lists and uint16 arrays are both accepted.
+
+    Args:
+        matrix: A 9x9 matrix (list of lists or NumPy array) containing integers from 0-9.
+        row_mask: The 9 row bitmasks of the numbers present in the matrix.
+        col_mask: The 9 column bitmasks of the numbers present in the matrix.
+        box_mask: The 9 box bitmasks of the numbers present in the matrix.
+        verbose: If True, print each unique intersection found. Defaults to False.
+
+    Returns:
+        A list of (row_index, col_index, value) tuples, as in find_unique_intersections.
+
+    Raises:
+        ValueError: If the matrix is not 9x9 or a mask does not have 9 elements.
+    """
+    # The compiled kernels are declared for writable arrays and do no bounds checks;
+    # writable arrays of the right type and shape are not copied, anything else
+    # (lists, read-only arrays) is, and other shapes are rejected
+    grid = _require_array(matrix, np.int8, (9, 9))
+    out = np.empty((81, 3), dtype=np.int32)
+    count = _kernels.find_unique_intersections_nb(
+        grid,
+        _require_array(row_mask, np.uint16, (9,)),
+        _require_array(col_mask, np.uint16, (9,)),
+        _require_array(box_mask, np.uint16, (9,)),
+        out,
+    )
+
+    result = [tuple(triple) for triple in out[:count].tolist()]
+    if verbose:
+        for row_index, col_index, unique_value in result:
+            print(
+                f"Interseção única encontrada na linha {row_index}, coluna {col_index}: {unique_value}"
+            )
 
     return result
+
+
+def backtrack(
+    matrix: SudokuMatrix,
+    row_mask: list[int],
+    col_mask: list[int],
+    box_mask: list[int],
+) -> bool:
+    """
+    Fill the remaining empty cells by trying candidates and undoing wrong guesses.
+
+    Used when find_unique_intersections stops finding cells. At each step the
+    empty cell with the fewest candidates is chosen (so forced cells are filled
+    first and dead ends are found early), each candidate is placed in turn and
+    the search continues recursively. Candidates are read from the masks, so
+    checking a cell costs a few bitwise operations.
+
+    The search runs on a flat bytearray copy of the 81 cells, indexed as
+    row_index * 9 + col_index, and the result is copied back into the matrix.
+
+    Args:
+        matrix: A 9x9 matrix (list of lists or NumPy array) containing integers from 0-9.
+        row_mask: The 9 row bitmasks of the numbers present in the matrix.
+        col_mask: The 9 column bitmasks of the numbers present in the matrix.
+        box_mask: The 9 box bitmasks of the numbers present in the matrix.
+
+    Returns:
+        True if the puzzle was solved; the matrix and the masks are then updated
+        in place. False if it has no solution, in which case they are left unchanged.
+        A matrix that already repeats a number in a row, column or 3x3 box (for
+        example after one pass of unique intersections filled the same number in
+        two cells of a unit) has no solution and returns False without searching.
+    """
+    # The masks cannot show a repeated number, so check the matrix itself
+    if not is_valid_sudoku(matrix):
+        return False
+
+    cells = bytearray(np.asarray(matrix, dtype=np.int8).tobytes())
+
+    if not _backtrack_cells(cells, row_mask, col_mask, box_mask):
+        return False
+
+    for row_index in range(9):
+        matrix[row_index][:] = list(cells[row_index * 9 : row_index * 9 + 9])
+
+    return True
+
+
+def _backtrack_cells(
+    cells: bytearray,
+    row_mask: list[int],
+    col_mask: list[int],
+    box_mask: list[int],
+) -> bool:
+    """
+    Recursive search of backtrack, on the flat bytearray of the 81 cells.
+    """
+    # Find the empty cell with the fewest candidates; find() skips filled cells in C
+    best_cell = None
+    best_count = 10
+    index = cells.find(0)
+    while index != -1:
+        row_index, col_index = divmod(index, 9)
+        box_index = BOX_INDEX[index]
+        candidates = FULL_MASK & ~(
+            row_mask[row_index] | col_mask[col_index] | box_mask[box_index]
+        )
+        count = bin(candidates).count("1")
+        if count < best_count:
+            best_cell = (index, row_index, col_index, box_index, candidates)
+            best_count = count
+            if count <= 1:
+                break
+        index = cells.find(0, index + 1)
+
+    # No empty cell left: the puzzle is solved
+    if best_cell is None:
+        return True
+
+    index, row_index, col_index, box_index, candidates = best_cell
+
+    # Try each candidate, lowest number first
+    while candidates:
+        bit = candidates & -candidates
+        candidates ^= bit
+
+        cells[index] = bit.bit_length()
+        row_mask[row_index] |= bit
+        col_mask[col_index] |= bit
+        box_mask[box_index] |= bit
+
+        if _backtrack_cells(cells, row_mask, col_mask, box_mask):
+            return True
+
+        # Undo the guess
+        row_mask[row_index] ^= bit
+        col_mask[col_index] ^= bit
+        box_mask[box_index] ^= bit
+
+    cells[index] = 0
+    return False
+
+
+def solve_batch(grids: np.ndarray) -> np.ndarray:
+    """
+    Solve many Sudoku puzzles at once.
+
+    The puzzles are stacked in a single (N, 9, 9) array, so each step of the
+    algorithm runs once for the whole batch instead of once per puzzle:
+    1. The row, column and box masks of all puzzles are computed with NumPy OR reductions
+    2. find_unique_intersections runs on every puzzle in parallel (compiled kernel)
+    3. All unique intersections found are filled and their bits are added to the masks
+    4. Steps 2 and 3 repeat while any puzzle finds a unique intersection
+    Only the puzzles that are still not solved after that go through backtrack,
+    one by one.
+
+    Args:
+        grids: An array (or nested lists) of shape (N, 9, 9) containing integers
+               from 0-9, 0 for empty cells. The puzzles must be valid (no repeated
+               numbers in a row, column or 3x3 box). The input is not modified.
+
+    Returns:
+        An (N, 9, 9) int8 array with the solved puzzles, in the same order.
+        A puzzle that has no solution is returned as far as it could be filled;
+        use is_solved_sudoku to check the results. Puzzles where filling unique
+        intersections repeated a number in a unit are known to have no solution
+        and are not backtracked.
+
+    Raises:
+        ValueError: If grids does not have the shape (N, 9, 9).
+    """
+    grids = np.array(grids, dtype=np.int8)
+    if grids.ndim != 3 or grids.shape[1:] != (9, 9):
+        raise ValueError(
+            f"Formato inválido: {grids.shape}. Esperado um array de formato (N, 9, 9)."
+        )
+
+    puzzle_count = grids.shape[0]
+
+    # Bit of each cell's number (0 for empty cells), reduced along rows, columns and boxes
+    bits = (1 << grids.astype(np.uint16)) >> 1
+    row_masks = np.bitwise_or.reduce(bits, axis=2)
+    col_masks = np.bitwise_or.reduce(bits, axis=1)
+    box_masks = np.bitwise_or.reduce(
+        bits.reshape(puzzle_count, 3, 3, 3, 3), axis=(2, 4)
+    ).reshape(puzzle_count, 9)
+
+    out = np.empty((puzzle_count, 81, 3), dtype=np.int32)
+    counts = np.empty(puzzle_count, dtype=np.int32)
+
+    while True:
+        _kernels.find_unique_intersections_batch_nb(
+            grids, row_masks, col_masks, box_masks, out, counts
+        )
+
+        # Stop when no puzzle found a unique intersection
+        if not counts.any():
+            break
+
+        # Gather the triples of all puzzles, along with the puzzle each one belongs to
+        puzzle_index = np.repeat(np.arange(puzzle_count), counts)
+        row_index, col_index, value = out[np.arange(81) < counts[:, None]].T
+
+        # Fill the values and add their bits to the masks (several values can share a mask)
+        grids[puzzle_index, row_index, col_index] = value
+        bit = (1 << (value - 1)).astype(np.uint16)
+        box_index = (row_index // 3) * 3 + col_index // 3
+        np.bitwise_or.at(row_masks, (puzzle_index, row_index), bit)
+        np.bitwise_or.at(col_masks, (puzzle_index, col_index), bit)
+        np.bitwise_or.at(box_masks, (puzzle_index, box_index), bit)
+
+    # A pass can fill the same number in two cells of a unit, and the OR above hides it.
+    # Such a unit has fewer bits in its mask than filled cells: the puzzle has no solution.
+    filled = (grids != 0).astype(np.int8)
+    conflict = (
+        (BIT_COUNT_FOR_MASK[row_masks] != filled.sum(axis=2)).any(axis=1)
+        | (BIT_COUNT_FOR_MASK[col_masks] != filled.sum(axis=1)).any(axis=1)
+        | (
+            BIT_COUNT_FOR_MASK[box_masks]
+            != filled.reshape(puzzle_count, 3, 3, 3, 3)
+            .sum(axis=(2, 4))
+            .reshape(puzzle_count, 9)
+        ).any(axis=1)
+    )
+
+    # Fall back to backtracking for the puzzles that are not solved yet and can be
+    solved = (
+        (row_masks == FULL_MASK).all(axis=1)
+        & (col_masks == FULL_MASK).all(axis=1)
+        & (box_masks == FULL_MASK).all(axis=1)
+    )
+    for index in np.flatnonzero(~solved & ~conflict).tolist():
+        backtrack(
+            grids[index],
+            row_masks[index].tolist(),
+            col_masks[index].tolist(),
+            box_masks[index].tolist(),
+        )
+
+    return grids